@@ -1,8 +1,9 @@
 import json
-import re
 import os
 import shutil
 
+import flag_matching
+
 def check_missing_flags(judgment_file_path):
     """
     檢查單個判決書檔案缺少哪些必要標記
@@ -20,45 +21,14 @@ def check_missing_flags(judgment_file_path):
         }
     """
     try:
-        # 讀取標記配置
-        with open('judgment_parsing_flag.json', 'r', encoding='utf-8') as f:
-            flags_config = json.load(f)
-        
-        # 讀取判決書檔案
-        with open(judgment_file_path, 'r', encoding='utf-8') as f:
-            judgment_data = json.load(f)
-        
-        # 取得判決書內容
-        judgment_content = judgment_data.get('JFULL', '')
+        # 讀取標記配置（快取，不會每個檔案重新讀取）
+        flags_config = flag_matching.load_flags_config()
         
-        necessary_flags = flags_config['necessary_flags']
-        missing_flags = []
-        found_flags = {}
+        # 讀取判決書檔案，只解析 JFULL 欄位
+        judgment_content = flag_matching.read_jfull(judgment_file_path)
         
         # 檢查每個必要標記類別
-        for flag_type, flag_list in necessary_flags.items():
-            category_found = False
-            matched_flags_in_category = []
-            
-            # 檢查該類別中的每個標記
-            for flag in flag_list:
-                # 特殊處理日期標記
-                if flag == "中華民國年月日":
-                    pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in "中華民國") + r'.*?' + r'\s*'.join(re.escape(char) for char in "年") + r'.*?' + r'\s*'.join(re.escape(char) for char in "月") + r'.*?' + r'\s*'.join(re.escape(char) for char in "日") + r'\s*$'
-                else:
-                    # 建立正則表達式模式：允許字符間有空白，並允許在行結束前有各種冒號
-                    pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in flag) + r'\s*[：:︰]?\s*$'
-                
-                # 使用 multiline 和 dotall 模式進行匹配
-                if re.search(pattern, judgment_content, re.MULTILINE | re.DOTALL):
-                    category_found = True
-                    matched_flags_in_category.append(flag)
-            
-            # 記錄結果
-            if category_found:
-                found_flags[flag_type] = matched_flags_in_category
-            else:
-                missing_flags.append(flag_type)
+        missing_flags, found_flags = flag_matching.missing_flags(judgment_content, flags_config)
         
         return {
             'has_all_flags': len(missing_flags) == 0,
@@ -18,12 +18,9 @@ def get_json_files(directory: str) -> List[str]:
     if not os.path.exists(directory):
         raise FileNotFoundError(f"目錄不存在: {directory}")
     
-    json_files = []
-    for filename in os.listdir(directory):
-        if filename.endswith('.json'):
-            json_files.append(os.path.join(directory, filename))
-    
-    return json_files
+    # scandir 的 DirEntry 已帶有完整路徑與檔案類型，不需另外組合路徑或 stat
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
 
 
 def select_random_files(input_directory: str, n: int, output_directory: str, seed: Optional[int] = None) -> dict:
@@ -73,21 +70,28 @@ def select_random_files(input_directory: str, n: int, output_directory: str, see
     copied_files = []
     failed_files = []
     
+    # 一次列出輸出目錄中已存在的檔名，之後的撞名檢查都在記憶體中完成，不需逐一 stat
+    existing_filenames = set(os.listdir(output_directory))
+    
     for file_path in selected_files:
         try:
             filename = os.path.basename(file_path)
-            output_path = os.path.join(output_directory, filename)
             
             # 如果目標檔案已存在，添加編號避免覆蓋
+            new_filename = filename
             counter = 1
-            original_output_path = output_path
-            while os.path.exists(output_path):
+            while new_filename in existing_filenames:
                 name, ext = os.path.splitext(filename)
                 new_filename = f"{name}_{counter}{ext}"
-                output_path = os.path.join(output_directory, new_filename)
                 counter += 1
+            output_path = os.path.join(output_directory, new_filename)
             
-            shutil.copy2(file_path, output_path)
+            # 同一檔案系統時以硬連結取代複製，不需讀寫檔案內容；跨檔案系統等失敗情況才實際複製
+            try:
+                os.link(file_path, output_path)
+            except OSError:
+                shutil.copy2(file_path, output_path)
+            existing_filenames.add(new_filename)
             copied_files.append({
                 'source': file_path,
                 'destination': output_path,
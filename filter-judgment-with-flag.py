@@ -1,7 +1,11 @@
+import hashlib
 import json
-import re
 import os
 import shutil
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+import flag_matching
 
 def check_if_flag_exists(judgment_content, flags_config):
     """
@@ -14,44 +18,61 @@ def check_if_flag_exists(judgment_content, flags_config):
     Returns:
         bool: 是否所有必要標記都存在
     """
-    necessary_flags = flags_config['necessary_flags']
+    return flag_matching.has_all_flags(judgment_content, flags_config)
+
+def _check_judgment_file(judgment_file):
+    """
+    在子行程中檢查單一判決書檔案是否符合條件
     
-    # 檢查每個必要標記類別
-    for flag_type, flag_list in necessary_flags.items():
-        category_found = False
-        
-        # 檢查該類別中的每個標記
-        for flag in flag_list:
-            # 特殊處理日期標記
-            if flag == "中華民國年月日":
-                pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in "中華民國") + r'.*?' + r'\s*'.join(re.escape(char) for char in "年") + r'.*?' + r'\s*'.join(re.escape(char) for char in "月") + r'.*?' + r'\s*'.join(re.escape(char) for char in "日") + r'\s*$'
-            else:
-                # 建立正則表達式模式：允許字符間有空白，並允許在行結束前有各種冒號
-                pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in flag) + r'\s*[：:︰]?\s*$'
-            
-            # 使用 multiline 和 dotall 模式進行匹配
-            if re.search(pattern, judgment_content, re.MULTILINE | re.DOTALL):
-                category_found = True
-                break
-        
-        # 如果該類別完全沒有匹配，返回 False
-        if not category_found:
-            return False
+    Args:
+        judgment_file: 判決書檔案路徑
+    
+    Returns:
+        tuple: (是否符合條件, 錯誤訊息或 None)
+    """
+    try:
+        # 讀取判決書 JSON 檔案，只解析 JFULL 欄位
+        judgment_content = flag_matching.read_jfull(judgment_file)
+        return check_if_flag_exists(judgment_content, flag_matching.pool_flags_config()), None
+    except Exception as e:
+        return False, str(e)
+
+# 處理紀錄的格式與判定規則版本，修改比對邏輯或紀錄格式時需遞增，舊紀錄便不會再被採用
+_PROCESSED_LOG_VERSION = 1
+
+def _processed_log_path(input_path, flags_config):
+    """
+    取得處理紀錄檔路徑，檔名包含紀錄版本與標記配置的雜湊值，修改配置或比對邏輯後會自動使用新的紀錄
+    """
+    config_text = json.dumps(flags_config['necessary_flags'], ensure_ascii=False, sort_keys=True)
+    config_hash = hashlib.sha1(config_text.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(input_path, f'.processed-v{_PROCESSED_LOG_VERSION}-{config_hash}.tsv')
+
+def _load_skipped_files(log_path):
+    """
+    讀取處理紀錄中已判定為不符合條件的檔名（紀錄不存在時返回空集合）
+    """
+    if not os.path.exists(log_path):
+        return set()
     
-    # 所有必要標記都找到了
-    return True
+    with open(log_path, 'r', encoding='utf-8') as f:
+        records = (line.rstrip('\n').split('\t', 1) for line in f if line.strip())
+        return {record[0] for record in records if record[-1] == 'skipped'}
 
-def filter_judgments(input_path, output_path):
+def filter_judgments(input_path, output_path, max_workers=None, resume=False):
     """
     過濾判決書檔案，將符合條件的移動到輸出目錄
     
     Args:
         input_path: 輸入目錄路徑
         output_path: 輸出目錄路徑
+        max_workers: 平行處理的行程數量（預設為 CPU 核心數）
+        resume: 是否在輸入目錄中寫入處理紀錄，並略過先前執行時已判定為不符合條件的檔案（預設關閉，
+                關閉時不會讀寫任何紀錄檔）。紀錄只以檔名、標記配置與紀錄版本為依據，之後放入同名的新檔案
+                不會被重新檢查，因此只應在中斷後接續同一批檔案時使用
     """
     # 讀取標記配置（只讀取一次）
-    with open('judgment_parsing_flag.json', 'r', encoding='utf-8') as f:
-        flags_config = json.load(f)
+    flags_config = flag_matching.load_flags_config()
     
     # 創建輸出目錄（如果不存在）
     if not os.path.exists(output_path):
@@ -59,43 +80,65 @@ def filter_judgments(input_path, output_path):
         print(f"Created output directory: {output_path}")
     
     # 取得所有 .json 檔案
-    json_files = [filename for filename in os.listdir(input_path) if filename.endswith('.json')]
-    total_files = len(json_files)
+    with os.scandir(input_path) as entries:
+        json_entries = [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+    total_files = len(json_entries)
     moved_count = 0
     
     print(f"Found {total_files} JSON files to process...")
     
-    # 處理每個檔案
-    for i, filename in enumerate(json_files, 1):
-        judgment_file = os.path.join(input_path, filename)
+    # 略過先前執行時已判定為不符合的檔案（符合的檔案已被移走，不會再出現）
+    processed_log_path = _processed_log_path(input_path, flags_config) if resume else None
+    skipped_before = _load_skipped_files(processed_log_path) if resume else set()
+    if skipped_before:
+        json_entries = [entry for entry in json_entries if entry.name not in skipped_before]
+        print(f"Skipping {total_files - len(json_entries)} files already checked in a previous run")
+    
+    json_files = [entry.name for entry in json_entries]
+    judgment_files = [entry.path for entry in json_entries]
+    pending_files = len(json_files)
+    
+    # 以多行程平行檢查每個檔案，移動檔案與寫入處理紀錄則統一在主行程中依序進行
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=flag_matching.init_pool_worker, initargs=(flags_config,)) as executor, \
+            (open(processed_log_path, 'a', encoding='utf-8', buffering=1) if resume else nullcontext()) as processed_log:
+        results = executor.map(_check_judgment_file, judgment_files, chunksize=flag_matching.POOL_CHUNK_SIZE)
         
-        try:
-            # 讀取判決書 JSON 檔案
-            with open(judgment_file, 'r', encoding='utf-8') as f:
-                judgment_data = json.load(f)
-            
-            # 取得判決書內容
-            judgment_content = judgment_data.get('JFULL', '')
+        for i, (filename, judgment_file, (matched, error)) in enumerate(zip(json_files, judgment_files, results), 1):
+            if error is not None:
+                print(f"[{i}/{pending_files}] Error processing {filename}: {error}")
+                continue
             
-            # 檢查是否符合條件
-            if check_if_flag_exists(judgment_content, flags_config):
-                # 移動到輸出目錄
-                destination_file = os.path.join(output_path, filename)
-                shutil.move(judgment_file, destination_file)
-                moved_count += 1
-                # 只有當檔案名稱不包含「小」字時才顯示訊息
-                if '小' not in filename:
-                    print(f"[{i}/{total_files}] Moved: {os.path.join(output_path, filename)}")
-            else:
-                # 只有當檔案名稱不包含「小」字時才顯示訊息
-                if '小' not in filename:
-                    print(f"[{i}/{total_files}] Skipped: {os.path.join(input_path, filename)}")
+            try:
+                # 檢查是否符合條件
+                if matched:
+                    # 移動到輸出目錄
+                    destination_file = os.path.join(output_path, filename)
+                    try:
+                        # 同一檔案系統時直接重新命名，不必經過 shutil.move 的額外檢查
+                        os.replace(judgment_file, destination_file)
+                    except OSError:
+                        # 跨檔案系統等無法直接重新命名的情況，改用 shutil.move 複製後刪除
+                        shutil.move(judgment_file, destination_file)
+                    moved_count += 1
+                    # 只有當檔案名稱不包含「小」字時才顯示訊息
+                    if '小' not in filename:
+                        print(f"[{i}/{pending_files}] Moved: {os.path.join(output_path, filename)}")
+                else:
+                    # 只有當檔案名稱不包含「小」字時才顯示訊息
+                    if '小' not in filename:
+                        print(f"[{i}/{pending_files}] Skipped: {os.path.join(input_path, filename)}")
+                
+                # 逐行寫入處理紀錄（行緩衝），中斷時已完成的判定不會遺失
+                if processed_log is not None:
+                    processed_log.write(f"{filename}\t{'moved' if matched else 'skipped'}\n")
 
-        except Exception as e:
-            print(f"[{i}/{total_files}] Error processing {filename}: {e}")
+            except Exception as e:
+                print(f"[{i}/{pending_files}] Error processing {filename}: {e}")
     
     print(f"\nFiltering completed!")
-    print(f"Total files processed: {total_files}")
+    print(f"Total files processed: {pending_files}")
+    if skipped_before:
+        print(f"Files skipped (checked in a previous run): {total_files - pending_files}")
     print(f"Files moved: {moved_count}")
     print(f"Files remaining in original directory: {total_files - moved_count}")
 
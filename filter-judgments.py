@@ -1,10 +1,53 @@
+import codecs
 import json
 import os
+import re
+import shutil
+import subprocess
 import tempfile
 import threading
 from concurrent.futures import ThreadPoolExecutor
 import queue
 
+import flag_matching
+
+# JFULL follows a few short metadata fields, so it starts well within this many bytes
+_HEAD_BYTES = 4096
+_JFULL_HEAD_PATTERN = re.compile(r'"JFULL"\s*:\s*"((?:[^"\\]|\\.)*)(")?')
+_PARTIAL_ESCAPE_PATTERN = re.compile(r'\\u[0-9a-fA-F]{0,3}$')
+
+def _read_jfull_head(file_path):
+    """Decode the start of the JFULL string from the file head only
+
+    Returns (text, complete) where complete tells whether the whole string fit in
+    the head, or None when JFULL does not start within the head.
+    """
+    with open(file_path, 'rb') as file:
+        head = file.read(_HEAD_BYTES)
+    # an incremental decoder tolerates a multi-byte character cut at the end of the head
+    text = codecs.getincrementaldecoder('utf-8')().decode(head)
+    match = _JFULL_HEAD_PATTERN.search(text)
+    if match is None:
+        return None
+    escaped, complete = match.group(1), match.group(2) is not None
+    if not complete:
+        # drop a \uXXXX escape cut at the end of the head
+        escaped = _PARTIAL_ESCAPE_PATTERN.sub('', escaped)
+    try:
+        return json.loads('"' + escaped + '"'), complete
+    except json.JSONDecodeError:
+        return None
+
+def _first_non_space_chars(text, count):
+    """Collect the first `count` non-space characters without scanning the rest of the text"""
+    chars = []
+    for c in text:
+        if not c.isspace():
+            chars.append(c)
+            if len(chars) == count:
+                break
+    return ''.join(chars)
+
 def filter_conditions(file_path):
     # setting condtions for filtering, if qualified, return True
     # if file path not contains '民事' return False
@@ -14,13 +57,15 @@ def filter_conditions(file_path):
     if '上' in file_path:
         return False
     # open file_path with json, if the "JFULL" attribute not contains '判決' in first 30 non-space-characters, return False
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-        jfull_text = data.get("JFULL", "")
-        # Check the first 30 non-space characters
-        non_space_text = ''.join(c for c in jfull_text if not c.isspace())
-        if '判決' not in non_space_text[:30]:
-            return False
+    # Decide from the file head when it holds enough of JFULL, otherwise decode the whole field
+    head = _read_jfull_head(file_path)
+    if head is not None and (head[1] or len(_first_non_space_chars(head[0], 30)) == 30):
+        jfull_start = head[0]
+    else:
+        jfull_start = flag_matching.read_jfull(file_path)
+    # Check the first 30 non-space characters
+    if '判決' not in _first_non_space_chars(jfull_start, 30):
+        return False
     # if all conditions are met, return True
     return True
 
@@ -29,8 +74,9 @@ def process_rar_file(rar_file_info):
     file_name, file_path = rar_file_info
     
     with tempfile.TemporaryDirectory() as temp_dir:
-        # Extract the current .rar file
-        os.system(f'unrar x "{file_path}" "{temp_dir}"')
+        # Extract the current .rar file; passing an argument list avoids spawning
+        # /bin/sh and keeps paths with quotes or spaces intact
+        subprocess.run(['unrar', 'x', file_path, temp_dir])
         
         processed_count = 0
         # Filter all the json files in this temporary directory
@@ -41,10 +87,13 @@ def process_rar_file(rar_file_info):
                     if filter_conditions(json_file_path):
                         # copy the qualified json file to '../data/filtered_judgments'
                         target_path = os.path.join('../data/filtered_judgments', file)
-                        with open(json_file_path, 'r', encoding='utf-8') as src_file:
-                            data = json.load(src_file)
-                        with open(target_path, 'w', encoding='utf-8') as dest_file:
-                            json.dump(data, dest_file, ensure_ascii=False, indent=4)
+                        # the content is not modified, so hard-link it instead of parsing
+                        # and re-serializing; fall back to a plain copy across filesystems
+                        # (or when the target already exists, which copyfile overwrites)
+                        try:
+                            os.link(json_file_path, target_path)
+                        except OSError:
+                            shutil.copyfile(json_file_path, target_path)
                         processed_count += 1
         
         print(f"Processed {file_name} - Found {processed_count} qualified files")
@@ -0,0 +1,292 @@
+import functools
+import json
+import re
+
+# 日期標記幾乎都位於判決書結尾，先只掃描最後約這麼多字元，找不到才掃描全文
+SCAN_TAIL_CHARS = 2048
+
+_JFULL_KEY_PATTERN = re.compile(r'"JFULL"\s*:\s*"')
+
+# 以行程池平行處理判決書時，每次派送給子行程的檔案數量，用來攤平行程間傳遞資料的成本
+POOL_CHUNK_SIZE = 64
+
+# 子行程中的標記配置，由 init_pool_worker 在每個子行程啟動時設定一次
+_pool_flags_config = None
+
+@functools.lru_cache(maxsize=1)
+def load_flags_config(config_path='judgment_parsing_flag.json'):
+    """
+    讀取標記配置（同一路徑只讀取並解析一次）
+    """
+    with open(config_path, 'rb') as f:
+        return json.loads(f.read())
+
+def init_pool_worker(flags_config):
+    """
+    行程池的子行程初始化：保存標記配置，避免每個任務重複傳遞
+    
+    Args:
+        flags_config: 標記配置
+    """
+    global _pool_flags_config
+    _pool_flags_config = flags_config
+
+def pool_flags_config():
+    """
+    取得子行程中由 init_pool_worker 保存的標記配置
+    """
+    return _pool_flags_config
+
+def read_jfull(file_path):
+    """
+    只取出判決書 JSON 檔案中的 JFULL 字串，不建立其餘欄位的物件
+    
+    Args:
+        file_path: 判決書 JSON 檔案路徑
+    
+    Returns:
+        str: JFULL 內容，沒有該欄位時返回空字串
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read().decode('utf-8')
+    
+    # 只有單一判決書物件才走快速路徑；陣列等其他結構退回完整解析，維持原本的錯誤行為
+    match = _JFULL_KEY_PATTERN.search(raw) if raw.lstrip().startswith('{') else None
+    if match is None:
+        # 找不到 JFULL 字串或不是物件時退回完整解析
+        return json.loads(raw).get('JFULL', '')
+    # 定位第一個 "JFULL": " 之後直接解碼該字串（字串內的引號必為 \" 跳脫，不會誤判）；
+    # 前提是判決書物件中沒有巢狀的 JFULL 欄位，否則會取到巢狀物件中的值
+    return json.decoder.scanstring(raw, match.end())[0]
+
+@functools.lru_cache(maxsize=None)
+def _create_flag_body(flag):
+    """
+    建立 flag 本體的正則表達式字串：逐字跳脫，並允許字符間有空白（每個 flag 只建立一次）
+    """
+    return r'\s*'.join(re.escape(char) for char in flag)
+
+def _create_pattern(flag):
+    """
+    為指定的 flag 建立正則表達式字串
+    """
+    # 特殊處理日期標記
+    # 以「第一個年、其後第一個月」的否定字元集取代巢狀的 .*?，匹配結果相同，
+    # 但避免在不匹配時大量回溯（原本最差為文件長度的三次方）
+    if flag == "中華民國年月日":
+        return r'^\s*' + _create_flag_body("中華民國") + r'[^年]*年[^月]*月.*日\s*$'
+    # 建立正則表達式模式：允許字符間有空白，並允許在行結束前有各種冒號
+    return r'^\s*' + _create_flag_body(flag) + r'\s*[：:︰]?\s*$'
+
+def _create_category_pattern(flag_list):
+    """
+    將同一類別的所有 flag 合併為單一正則表達式字串，一次掃描即可判斷該類別是否存在
+    """
+    # 一般標記共用開頭與結尾（空白、冒號），只在中間做選擇
+    alternatives = [_create_flag_body(flag) for flag in flag_list if flag != "中華民國年月日"]
+    patterns = []
+    if alternatives:
+        patterns.append(r'^\s*(?:' + '|'.join(alternatives) + r')\s*[：:︰]?\s*$')
+    # 日期標記的結尾規則不同，獨立成一個分支
+    if "中華民國年月日" in flag_list:
+        patterns.append(_create_pattern("中華民國年月日"))
+    if not patterns:
+        # 空類別永遠不匹配
+        return r'(?!)'
+    return '|'.join('(?:' + pattern + ')' for pattern in patterns)
+
+@functools.lru_cache(maxsize=None)
+def _compile_category_pattern(flag_list):
+    """
+    編譯指定類別的合併正則表達式（flag_list 需為 tuple 以便快取）
+    """
+    return re.compile(_create_category_pattern(flag_list), re.MULTILINE | re.DOTALL)
+
+@functools.lru_cache(maxsize=None)
+def _required_chars(flag):
+    """
+    取得 flag 中不重複的字元，正則要匹配時這些字元都必須出現在內容中
+    """
+    return tuple(dict.fromkeys(flag))
+
+def _may_contain_flag(judgment_content, flag):
+    """
+    以子字串搜尋快速排除不可能匹配的 flag（C 層的字元搜尋遠比正則掃描便宜）
+    """
+    return all(char in judgment_content for char in _required_chars(flag))
+
+def _tail_window(judgment_content):
+    """
+    取得判決書結尾約 SCAN_TAIL_CHARS 個字元，並從完整的一行開頭切齊
+    
+    切齊行首後，視窗內找到的匹配在全文中必定也成立（^ 與 $ 的位置不變），
+    因此只能用來提早確認匹配，不會改變結果。
+    
+    Returns:
+        str or None: 結尾視窗，內容太短或找不到行首時返回 None
+    """
+    if len(judgment_content) <= SCAN_TAIL_CHARS:
+        return None
+    
+    line_start = judgment_content.find('\n', len(judgment_content) - SCAN_TAIL_CHARS)
+    if line_start == -1:
+        return None
+    return judgment_content[line_start + 1:]
+
+def _category_found(judgment_content, flag_list):
+    """
+    以合併後的類別模式判斷該類別是否有任何標記存在
+    """
+    category_pattern = _compile_category_pattern(tuple(flag_list))
+    
+    # 日期類別先掃描結尾視窗，大多數判決書不必從頭掃描全文
+    if "中華民國年月日" in flag_list:
+        tail = _tail_window(judgment_content)
+        if tail is not None and category_pattern.search(tail):
+            return True
+    
+    return category_pattern.search(judgment_content) is not None
+
+def _create_flag_alternative(flag):
+    """
+    建立 flag 去掉開頭 ^ 的正則表達式字串，用於合併成多 flag 的模式
+    """
+    return _create_pattern(flag)[1:]
+
+@functools.lru_cache(maxsize=None)
+def _compile_flags_scanner(flags):
+    """
+    將所有 flag 合併為單一正則表達式，一次掃描即可得知每個 flag 是否存在
+    
+    每個 flag 各自放在一個可選的 lookahead 命名群組 f_<索引> 中，在同一行首位置
+    逐一嘗試，因此同一位置可同時記錄多個 flag；整個模式不消耗字元，
+    日期標記的 .* 也不會吞掉後面的行。開頭的 lookahead 讓沒有任何 flag 的行首直接略過。
+    
+    Args:
+        flags: 所有 flag 的 tuple（不重複）
+    
+    Returns:
+        re.Pattern: 合併後的正則表達式
+    """
+    alternatives = [_create_flag_alternative(flag) for flag in flags]
+    pattern = r'^(?=' + '|'.join(alternatives) + ')' + ''.join(
+        f'(?:(?=(?P<f_{index}>{alternative}))|)' for index, alternative in enumerate(alternatives)
+    )
+    return re.compile(pattern, re.MULTILINE | re.DOTALL)
+
+def _all_flags(flags_config):
+    """
+    取得配置中所有不重複的 flag（依配置順序）
+    """
+    return tuple(dict.fromkeys(flag for flag_list in flags_config['necessary_flags'].values() for flag in flag_list))
+
+def _found_flags(judgment_content, flags):
+    """
+    單次掃描找出內容中出現的所有 flag
+    
+    Returns:
+        set: 出現的 flag 集合
+    """
+    # 沒有任何 flag 可能出現時不必掃描
+    if not any(_may_contain_flag(judgment_content, flag) for flag in flags):
+        return set()
+    
+    scanner = _compile_flags_scanner(flags)
+    found_indexes = set()
+    for match in scanner.finditer(judgment_content):
+        found_indexes.update(name for name, value in match.groupdict().items() if value is not None)
+    return {flags[int(name[2:])] for name in found_indexes}
+
+def has_all_flags(judgment_content, flags_config=None):
+    """
+    檢查判決書內容中是否存在所有必要標記類別
+    
+    Args:
+        judgment_content: 判決書內容字符串
+        flags_config: 標記配置（預設讀取 judgment_parsing_flag.json）
+    
+    Returns:
+        bool: 是否所有必要標記都存在
+    """
+    if flags_config is None:
+        flags_config = load_flags_config()
+    
+    # 只需判斷是否存在時，逐類別以合併模式搜尋並在第一個缺少的類別提早返回，
+    # 比 matched_flags / missing_flags 使用的全標記單次掃描更快
+    for flag_list in flags_config['necessary_flags'].values():
+        # 該類別沒有任何標記可能出現時，不必執行正則
+        if not any(_may_contain_flag(judgment_content, flag) for flag in flag_list):
+            return False
+        
+        # 如果該類別完全沒有匹配，返回 False
+        if not _category_found(judgment_content, flag_list):
+            return False
+    
+    # 所有必要標記都找到了
+    return True
+
+def matched_flags(judgment_content, flags_config=None):
+    """
+    獲取判決書內容中匹配到的具體標記
+    
+    Args:
+        judgment_content: 判決書內容字符串
+        flags_config: 標記配置（預設讀取 judgment_parsing_flag.json）
+    
+    Returns:
+        list: 匹配到的標記列表，如果所有類別都有匹配則返回匹配的標記，否則返回空列表
+    """
+    if flags_config is None:
+        flags_config = load_flags_config()
+    
+    categories = list(flags_config['necessary_flags'].values())
+    
+    # 任何類別的標記都不可能出現時，不必掃描
+    for flag_list in categories:
+        if not any(_may_contain_flag(judgment_content, flag) for flag in flag_list):
+            return []
+    
+    # 一次掃描取得所有出現的標記，再依類別與配置順序整理
+    found = _found_flags(judgment_content, _all_flags(flags_config))
+    
+    result = []
+    for flag_list in categories:
+        category_matched_flags = [flag for flag in flag_list if flag in found]
+        
+        # 如果該類別完全沒有匹配，返回空列表
+        if not category_matched_flags:
+            return []
+        
+        result.extend(category_matched_flags)
+    
+    return result
+
+def missing_flags(judgment_content, flags_config=None):
+    """
+    檢查判決書內容缺少哪些必要標記類別
+    
+    Args:
+        judgment_content: 判決書內容字符串
+        flags_config: 標記配置（預設讀取 judgment_parsing_flag.json）
+    
+    Returns:
+        tuple: (缺少的標記類別列表, 找到的標記 {flag_type: [matched_flags]})
+    """
+    if flags_config is None:
+        flags_config = load_flags_config()
+    
+    all_flags = _all_flags(flags_config)
+    found_flags = _found_flags(judgment_content, all_flags)
+    
+    missing = []
+    found = {}
+    for flag_type, flag_list in flags_config['necessary_flags'].items():
+        category_matched_flags = [flag for flag in flag_list if flag in found_flags]
+        
+        # 記錄結果
+        if category_matched_flags:
+            found[flag_type] = category_matched_flags
+        else:
+            missing.append(flag_type)
+    
+    return missing, found
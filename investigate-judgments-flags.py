@@ -1,7 +1,9 @@
-import json
-import re
 import os
+import sys
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import flag_matching
 
 def get_matched_flags(judgment_content, flags_config):
     """
@@ -14,35 +16,7 @@ def get_matched_flags(judgment_content, flags_config):
     Returns:
         list: 匹配到的標記列表，如果所有類別都有匹配則返回匹配的標記，否則返回空列表
     """
-    necessary_flags = flags_config['necessary_flags']
-    matched_flags = []
-    
-    # 檢查每個必要標記類別
-    for flag_type, flag_list in necessary_flags.items():
-        category_matched_flags = []
-        
-        # 檢查該類別中的每個標記
-        for flag in flag_list:
-            # 特殊處理日期標記
-            if flag == "中華民國年月日":
-                pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in "中華民國") + r'.*?' + r'\s*'.join(re.escape(char) for char in "年") + r'.*?' + r'\s*'.join(re.escape(char) for char in "月") + r'.*?' + r'\s*'.join(re.escape(char) for char in "日") + r'\s*$'
-            else:
-                # 建立正則表達式模式：允許字符間有空白，並允許在行結束前有各種冒號
-                pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in flag) + r'\s*[：:︰]?\s*$'
-            
-            # 使用 multiline 和 dotall 模式進行匹配
-            if re.search(pattern, judgment_content, re.MULTILINE | re.DOTALL):
-                category_matched_flags.append(flag)
-        
-        # 如果該類別完全沒有匹配，返回空列表
-        if not category_matched_flags:
-            return []
-        
-        # 添加該類別匹配到的標記到總列表
-        matched_flags.extend(category_matched_flags)
-    
-    # 所有必要標記類別都有匹配
-    return matched_flags
+    return flag_matching.matched_flags(judgment_content, flags_config)
 
 def check_if_flag_exists(judgment_content, flags_config):
     """
@@ -55,67 +29,115 @@ def check_if_flag_exists(judgment_content, flags_config):
     Returns:
         bool: 是否所有必要標記都存在
     """
-    matched_flags = get_matched_flags(judgment_content, flags_config)
-    return len(matched_flags) > 0
+    # 只需判斷是否存在，每個類別找到任一標記即可，不必找出所有匹配的標記
+    return flag_matching.has_all_flags(judgment_content, flags_config)
+
+# 逐檔訊息先累積在記憶體中，每處理這麼多個檔案才一次寫出
+_LOG_FLUSH_INTERVAL = 1000
+
+def _flush_log(log_lines):
+    """
+    將累積的訊息一次寫到標準輸出並清空
+    """
+    if log_lines:
+        log_lines.append('')
+        sys.stdout.write('\n'.join(log_lines))
+        sys.stdout.flush()
+        log_lines.clear()
 
-def analyze_judgment_flags(directory_path, flags_config_path):
+def _analyze_judgment_file(filepath):
+    """
+    在子行程中分析單一判決書檔案
+    
+    Args:
+        filepath: 判決書檔案路徑
+    
+    Returns:
+        tuple: (判決書內容字符數或 None, 匹配到的標記列表, 錯誤訊息或 None)
+    """
+    content_length = None
+    try:
+        # 讀取判決書內容（只解析 JFULL 欄位）
+        judgment_content = flag_matching.read_jfull(filepath)
+        content_length = len(judgment_content)
+        
+        # 獲取匹配到的標記
+        return content_length, get_matched_flags(judgment_content, flag_matching.pool_flags_config()), None
+    except Exception as e:
+        return content_length, [], str(e)
+
+def analyze_judgment_flags(directory_path, flags_config_path, max_workers=None):
     """
     分析目錄中所有判決書檔案的標記匹配情況
     
     Args:
         directory_path: 包含判決書 JSON 檔案的目錄路徑
         flags_config_path: 標記配置檔案路徑
+        max_workers: 平行處理的行程數量（預設為 CPU 核心數）
     """
     print(f"開始分析目錄: {directory_path}")
     
     # 載入標記配置
     print(f"載入標記配置檔案: {flags_config_path}")
-    with open(flags_config_path, 'r', encoding='utf-8') as f:
-        flags_config = json.load(f)
+    flags_config = flag_matching.load_flags_config(flags_config_path)
+    
+    # 為每個標記指定一個位元，標記組合以整數位元遮罩統計，不必逐檔排序與雜湊字串 tuple
+    all_flags = dict.fromkeys(flag for flag_list in flags_config['necessary_flags'].values() for flag in flag_list)
+    flag_bits = {flag: 1 << i for i, flag in enumerate(all_flags)}
     
     # 儲存每個檔案匹配到的標記
     file_flags = {}
     flag_combinations = []
     
     # 遍歷目錄中的所有 JSON 檔案
-    json_files = [f for f in os.listdir(directory_path) if f.endswith('.json')]
+    with os.scandir(directory_path) as entries:
+        json_entries = [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+    json_files = [entry.name for entry in json_entries]
+    filepaths = [entry.path for entry in json_entries]
     print(f"找到 {len(json_files)} 個 JSON 檔案")
     print("開始處理檔案...")
     print("-" * 50)
     
-    for i, filename in enumerate(json_files, 1):
-        print(f"處理檔案 {i}/{len(json_files)}: {filename}")
-        filepath = os.path.join(directory_path, filename)
+    # 以多行程平行分析，結果依原檔案順序回傳並在主行程中統計
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=flag_matching.init_pool_worker, initargs=(flags_config,)) as executor:
+        results = executor.map(_analyze_judgment_file, filepaths, chunksize=flag_matching.POOL_CHUNK_SIZE)
         
-        try:
-            # 讀取判決書內容
-            with open(filepath, 'r', encoding='utf-8') as f:
-                judgment_data = json.load(f)
-                judgment_content = judgment_data.get('JFULL', '')
+        # 逐檔訊息批次寫出，避免每行都取得 stdout 鎖並呼叫一次 write
+        log_lines = []
+        for i, (filename, (content_length, matched_flags, error)) in enumerate(zip(json_files, results), 1):
+            if i % _LOG_FLUSH_INTERVAL == 0:
+                _flush_log(log_lines)
             
-            print(f"  → 檔案大小: {len(judgment_content)} 字符")
+            log_lines.append(f"處理檔案 {i}/{len(json_files)}: {filename}")
             
-            # 獲取匹配到的標記
-            matched_flags = get_matched_flags(judgment_content, flags_config)
+            if content_length is not None:
+                log_lines.append(f"  → 檔案大小: {content_length} 字符")
+            
+            if error is not None:
+                log_lines.append(f"  → 處理檔案 {filename} 時發生錯誤: {error}")
+                continue
             
             if matched_flags:
                 file_flags[filename] = matched_flags
-                # 排序標記以便統計相同組合
-                sorted_flags = sorted(matched_flags)
-                flag_combinations.append(tuple(sorted_flags))
-                print(f"  → 匹配到的標記: {matched_flags}")
+                # 以位元遮罩記錄標記組合，相同組合必得到相同的整數
+                combination_bits = 0
+                for flag in matched_flags:
+                    combination_bits |= flag_bits[flag]
+                flag_combinations.append(combination_bits)
+                log_lines.append(f"  → 匹配到的標記: {matched_flags}")
             else:
-                print(f"  → 未找到所有必要標記")
-                
-        except Exception as e:
-            print(f"  → 處理檔案 {filename} 時發生錯誤: {e}")
-            continue
+                log_lines.append(f"  → 未找到所有必要標記")
+        
+        _flush_log(log_lines)
     
     print("-" * 50)
     print("檔案處理完成，開始統計結果...")
     
-    # 統計標記組合
-    combination_counts = Counter(flag_combinations)
+    # 統計標記組合，最後才將每種位元遮罩轉回排序後的標記 tuple
+    combination_counts = Counter({
+        tuple(sorted(flag for flag, bit in flag_bits.items() if combination_bits & bit)): count
+        for combination_bits, count in Counter(flag_combinations).items()
+    })
     
     print("\n" + "=" * 60)
     print("統計結果")
@@ -140,8 +162,6 @@ def analyze_judgment_flags(directory_path, flags_config_path):
     return file_flags, combination_counts
 
 if __name__ == "__main__":
-    import sys
-    
     print("判決書標記分析工具")
     print("=" * 60)
     
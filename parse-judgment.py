@@ -2,7 +2,8 @@ import json
 import re
 import os
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from typing import Dict, List, Optional, Tuple
 
 
@@ -12,6 +13,9 @@ class JudgmentParser:
     處理判決書的 JFULL 屬性，將其分解為結構化元件或重新組合
     """
     
+    # 不含換行的空白字元，用於在全文中逐行匹配時，讓空白不會跨到下一行
+    _LINE_SPACE = r'[^\S\n]'
+    
     def __init__(self):
         # 寫死的目錄路徑
         self.input_dir = '../data/filtered_judgments/'
@@ -32,79 +36,89 @@ class JudgmentParser:
             ['中華民國年月日', '主文', '事實'],
             ['中華民國年月日', '主文', '事實與理由']
         ]
+        
+        # 所有模式用到的標記（不重複，依出現順序）
+        all_flags = dict.fromkeys(self.special_four_part_pattern + [flag for pattern in self.supported_patterns for flag in pattern])
+        
+        # 將所有標記合併為單一正則表達式，每個標記各自一個命名群組，一次掃描全文即可定位所有標記
+        # （各標記的內容互不相同且都必須佔滿整行，同一行最多只會匹配到一個標記）
+        self._flags_by_group = {f'f{i}': flag for i, flag in enumerate(all_flags)}
+        # 各模式共同的行首空白提到群組外，不必在每個分支重新吸收一次
+        line_start = r'^' + self._LINE_SPACE + '*'
+        self._union_pattern = re.compile(line_start + '(?:' + '|'.join(
+            f'(?P<{group}>{self._create_pattern(flag, within_line=True)[len(line_start):]})' for group, flag in self._flags_by_group.items()
+        ) + ')', re.MULTILINE)
+        
+        # 每個模式都需要的字元（主文、中華民國年月日），全文缺少任一個時不可能有模式成立
+        self._required_chars = ''.join(sorted(set.intersection(
+            *(set(''.join(pattern)) for pattern in [self.special_four_part_pattern] + self.supported_patterns)
+        )))
     
-    def _create_pattern(self, flag: str) -> str:
+    def _create_pattern(self, flag: str, within_line: bool = False) -> str:
         """
         為指定的 flag 創建正則表達式模式
+        
+        Args:
+            flag: 標記文字
+            within_line: 是否用於 MULTILINE 全文掃描（空白與否定字元集皆不跨越換行，結果等同逐行匹配）
         """
+        space = self._LINE_SPACE if within_line else r'\s'
+        newline = r'\n' if within_line else ''
         if flag == "中華民國年月日":
-            pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in "中華民國") + r'.*?' + r'\s*'.join(re.escape(char) for char in "年") + r'.*?' + r'\s*'.join(re.escape(char) for char in "月") + r'.*?' + r'\s*'.join(re.escape(char) for char in "日") + r'\s*$'
+            # 與 flag_matching 相同改用否定字元集避免回溯；within_line 時字元集另外排除換行
+            pattern = '^' + space + '*' + (space + '*').join(re.escape(char) for char in "中華民國") + f'[^年{newline}]*年[^月{newline}]*月.*日' + space + '*$'
         else:
             # 建立正則表達式模式：允許字符間有空白，並允許在行結束前有各種冒號
-            pattern = r'^\s*' + r'\s*'.join(re.escape(char) for char in flag) + r'\s*[：:︰]?\s*$'
+            pattern = '^' + space + '*' + (space + '*').join(re.escape(char) for char in flag) + space + '*[：:︰]?' + space + '*$'
         return pattern
     
-    def _find_pattern_positions(self, lines: List[str], pattern_flags: List[str]) -> Dict[str, int]:
-        """
-        在文本行中找到各個標記的位置
+    def _scan_flag_spans(self, text: str, stop_at_date: bool = False) -> Dict[str, Tuple[int, int]]:
         """
-        positions = {}
+        以單一正則在全文中掃描一次，找到所有標記第一次出現的那一行
         
-        for flag in pattern_flags:
-            pattern = self._create_pattern(flag)
-            
-            for i, line in enumerate(lines):
-                if re.match(pattern, line.strip()):
-                    positions[flag] = i
+        Args:
+            text: 判決書全文
+            stop_at_date: 找到日期標記後即停止掃描（所有模式都要求其他標記位於日期之前，
+                          之後才出現的標記不會讓任何模式成立）
+        
+        Returns:
+            {flag: (該行起始位置, 該行結束位置)}
+        """
+        spans = {}
+        total_flags = len(self._flags_by_group)
+        
+        for match in self._union_pattern.finditer(text):
+            flag = self._flags_by_group[match.lastgroup]
+            if flag not in spans:
+                spans[flag] = match.span()
+                # 所有標記都已找到時不必再往下掃描
+                if len(spans) == total_flags or (stop_at_date and flag == '中華民國年月日'):
                     break
         
-        return positions
+        return spans
     
-    def _is_parse_result_valid(self, parsed_result: Dict[str, str]) -> bool:
+    def parse_judgment(self, jfull_text: str) -> Dict[str, str]:
         """
-        檢查解析結果是否有效
+        正向工程：將 JFULL 文本解析為結構化部分
         
         Args:
-            parsed_result: 解析結果字典
+            jfull_text: 原始判決書全文
             
         Returns:
-            如果解析結果有效則返回 True，否則返回 False
+            Dict 包含 'Pre-Information', 'Main', 'Fact and Reason', 'Post-Information', 'pattern'
         """
-        # 如果有錯誤或沒有找到模式，視為無效
-        if 'error' in parsed_result or not parsed_result.get('pattern'):
-            return False
-        
-        pattern = parsed_result.get('pattern')
-        
-        # 檢查主要部分是否為空
-        main_content = parsed_result.get('Main', '').strip()
-        if not main_content:
-            return False
-        
-        # 根據模式檢查相應的部分
-        if pattern == self.special_four_part_pattern:
-            # 四段式：檢查事實和理由是否為空
-            fact_content = parsed_result.get('Fact', '').strip()
-            reason_content = parsed_result.get('Reason', '').strip()
-            if not fact_content or not reason_content:
-                return False
-        else:
-            # 三段式：檢查事實及理由是否為空
-            fact_reason = parsed_result.get('Fact and Reason', '').strip()
-            if not fact_reason:
-                return False
-        
-        return True
+        return self._parse(jfull_text)[0]
     
-    def parse_judgment(self, jfull_text: str) -> Dict[str, str]:
+    def _parse(self, jfull_text: str) -> Tuple[Dict[str, str], bool]:
         """
-        正向工程：將 JFULL 文本解析為結構化部分
+        解析 JFULL 文本，並在各部分內容仍是區域變數時一併判斷結果是否有效
+        （有錯誤、主文為空，或事實/理由（三段式為事實及理由）為空時視為無效）
         
         Args:
             jfull_text: 原始判決書全文
             
         Returns:
-            Dict 包含 'Pre-Information', 'Main', 'Fact and Reason', 'Post-Information', 'pattern'
+            (解析結果, 解析結果是否有效)
         """
         if not jfull_text or not isinstance(jfull_text, str):
             return {
@@ -114,27 +128,31 @@ class JudgmentParser:
                 'Post-Information': '',
                 'pattern': None,
                 'error': 'Invalid input text'
-            }
+            }, False
         
-        lines = jfull_text.split('\n')
+        # 一次掃描全文，找出日期標記之前所有標記所在行的位置，各模式直接查詢
+        # 各部分內容直接依標記行的起訖位置切片原文（前後多出的換行會被 strip 去除）
+        # 先以子字串搜尋排除缺少必要字元的文本，不必執行正則掃描
+        if all(char in jfull_text for char in self._required_chars):
+            spans = self._scan_flag_spans(jfull_text, stop_at_date=True)
+        else:
+            spans = {}
         
         # 先檢查特殊的四段式模式
-        four_part_positions = self._find_pattern_positions(lines, self.special_four_part_pattern)
-        
-        if all(flag in four_part_positions for flag in self.special_four_part_pattern):
-            main_pos = four_part_positions['主文']
-            fact_pos = four_part_positions['事實']
-            reason_pos = four_part_positions['理由']
-            date_pos = four_part_positions['中華民國年月日']
+        if all(flag in spans for flag in self.special_four_part_pattern):
+            main_start, main_end = spans['主文']
+            fact_start, fact_end = spans['事實']
+            reason_start, reason_end = spans['理由']
+            date_start, date_end = spans['中華民國年月日']
             
             # 確保位置順序正確：主文 → 事實 → 理由 → 中華民國年月日
-            if main_pos < fact_pos < reason_pos < date_pos:
+            if main_start < fact_start < reason_start < date_start:
                 # 提取各部分內容
-                pre_info = '\n'.join(lines[:main_pos]).strip()
-                main_content = '\n'.join(lines[main_pos+1:fact_pos]).strip()
-                fact_content = '\n'.join(lines[fact_pos+1:reason_pos]).strip()
-                reason_content = '\n'.join(lines[reason_pos+1:date_pos]).strip()
-                post_info = '\n'.join(lines[date_pos+1:]).strip()
+                pre_info = jfull_text[:main_start].strip()
+                main_content = jfull_text[main_end:fact_start].strip()
+                fact_content = jfull_text[fact_end:reason_start].strip()
+                reason_content = jfull_text[reason_end:date_start].strip()
+                post_info = jfull_text[date_end:].strip()
                 
                 return {
                     'Pre-Information': pre_info,
@@ -143,25 +161,23 @@ class JudgmentParser:
                     'Reason': reason_content,
                     'Post-Information': post_info,
                     'pattern': self.special_four_part_pattern
-                }
+                }, bool(main_content and fact_content and reason_content)
         
         # 嘗試每個支援的三段式模式
         for pattern_flags in self.supported_patterns:
-            positions = self._find_pattern_positions(lines, pattern_flags)
-            
             # 檢查是否找到所有必要的標記
-            if all(flag in positions for flag in pattern_flags):
-                main_pos = positions['主文']
-                fact_reason_flag_pos = positions[pattern_flags[2]]  # list[2] 如 '事實及理由'
-                date_pos = positions['中華民國年月日']
+            if all(flag in spans for flag in pattern_flags):
+                main_start, main_end = spans['主文']
+                fact_reason_start, fact_reason_end = spans[pattern_flags[2]]  # list[2] 如 '事實及理由'
+                date_start, date_end = spans['中華民國年月日']
                 
                 # 確保位置順序正確：主文 → list[2] → 中華民國年月日
-                if main_pos < fact_reason_flag_pos < date_pos:
+                if main_start < fact_reason_start < date_start:
                     # 提取各部分內容
-                    pre_info = '\n'.join(lines[:main_pos]).strip()
-                    main_content = '\n'.join(lines[main_pos+1:fact_reason_flag_pos]).strip()
-                    fact_reason = '\n'.join(lines[fact_reason_flag_pos+1:date_pos]).strip()
-                    post_info = '\n'.join(lines[date_pos+1:]).strip()
+                    pre_info = jfull_text[:main_start].strip()
+                    main_content = jfull_text[main_end:fact_reason_start].strip()
+                    fact_reason = jfull_text[fact_reason_end:date_start].strip()
+                    post_info = jfull_text[date_end:].strip()
                     
                     return {
                         'Pre-Information': pre_info,
@@ -169,7 +185,7 @@ class JudgmentParser:
                         'Fact and Reason': fact_reason,
                         'Post-Information': post_info,
                         'pattern': pattern_flags
-                    }
+                    }, bool(main_content and fact_reason)
         
         # 如果沒有找到匹配的模式
         return {
@@ -179,7 +195,7 @@ class JudgmentParser:
             'Post-Information': jfull_text,
             'pattern': None,
             'error': 'No matching pattern found'
-        }
+        }, False
     
     def reconstruct_judgment(self, components: Dict[str, str]) -> str:
         """
@@ -198,68 +214,33 @@ class JudgmentParser:
         if not pattern:
             return ""
         
-        pre_info = components.get('Pre-Information', '').strip()
-        main_content = components.get('Main', '').strip()
-        post_info = components.get('Post-Information', '').strip()
-        
-        # 重建文本
-        parts = []
-        
-        if pre_info:
-            parts.append(pre_info)
+        get = components.get
+        main_content = get('Main', '').strip()
         
         # 檢查是否為四段式模式
         if pattern == self.special_four_part_pattern:
             # 四段式：主文 → 事實 → 理由 → 中華民國年月日
-            fact_content = components.get('Fact', '').strip()
-            reason_content = components.get('Reason', '').strip()
-            
-            # 添加主文標記
-            parts.append(pattern[1])  # '主文'
-            
-            if main_content:
-                parts.append(main_content)
-            
-            # 添加事實標記
-            parts.append(pattern[2])  # '事實'
-            
-            if fact_content:
-                parts.append(fact_content)
-            
-            # 添加理由標記
-            parts.append(pattern[3])  # '理由'
-            
-            if reason_content:
-                parts.append(reason_content)
-            
-            # 添加日期標記
-            parts.append(pattern[0])  # '中華民國年月日'
-            
+            sections = (
+                pattern[1], main_content,                   # '主文'
+                pattern[2], get('Fact', '').strip(),        # '事實'
+                pattern[3], get('Reason', '').strip(),      # '理由'
+                pattern[0],                                 # '中華民國年月日'
+            )
         elif len(pattern) == 3:
             # 三段式：主文 → list[2] → 中華民國年月日
-            fact_reason = components.get('Fact and Reason', '').strip()
-            
-            # 添加主文標記
-            parts.append(pattern[1])  # '主文'
-            
-            if main_content:
-                parts.append(main_content)
-            
-            # 添加事實理由標記
-            parts.append(pattern[2])  # 如 '事實及理由'
-            
-            if fact_reason:
-                parts.append(fact_reason)
-            
-            # 添加日期標記
-            parts.append(pattern[0])  # '中華民國年月日'
-        
-        if post_info:
-            parts.append(post_info)
+            sections = (
+                pattern[1], main_content,                       # '主文'
+                pattern[2], get('Fact and Reason', '').strip(), # 如 '事實及理由'
+                pattern[0],                                     # '中華民國年月日'
+            )
+        else:
+            sections = ()
         
-        return '\n'.join(parts)
+        # 重建文本：標記一定保留，空白的內容部分略過
+        parts = (get('Pre-Information', '').strip(), *sections, get('Post-Information', '').strip())
+        return '\n'.join(part for part in parts if part)
     
-    def process_json_file(self, file_path: str, output_path: str, delete_original: bool = True) -> bool:
+    def process_json_file(self, file_path: str, output_path: str, delete_original: bool = True, pretty: bool = False, verbose: bool = True) -> bool:
         """
         處理單個 JSON 檔案，解析其中的 JFULL 屬性並替換為 parsed_judgment
         
@@ -267,6 +248,8 @@ class JudgmentParser:
             file_path: 輸入 JSON 檔案路徑
             output_path: 輸出檔案路徑
             delete_original: 是否刪除原檔案
+            pretty: 是否以縮排格式輸出（方便人工檢視，但檔案較大且序列化較慢）
+            verbose: 是否顯示刪除原檔案的訊息
             
         Returns:
             處理是否成功
@@ -277,17 +260,18 @@ class JudgmentParser:
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 以二進位一次讀入後解析（json.loads 可直接解碼 UTF-8 位元組）
+            with open(file_path, 'rb') as f:
+                data = json.loads(f.read())
             
             if isinstance(data, list):
                 # 處理 JSON 陣列
                 for item in data:
                     if isinstance(item, dict) and 'JFULL' in item:
-                        parsed = self.parse_judgment(item['JFULL'])
+                        parsed, is_valid = self._parse(item['JFULL'])
                         
                         # 檢查解析結果是否有效（任何主要部分為空則視為失敗）
-                        if self._is_parse_result_valid(parsed):
+                        if is_valid:
                             # 移除原本的 JFULL，替換為 parsed_judgment
                             del item['JFULL']
                             item['parsed_judgment'] = parsed
@@ -297,10 +281,10 @@ class JudgmentParser:
             
             elif isinstance(data, dict) and 'JFULL' in data:
                 # 處理單一 JSON 物件
-                parsed = self.parse_judgment(data['JFULL'])
+                parsed, is_valid = self._parse(data['JFULL'])
                 
                 # 檢查解析結果是否有效
-                if self._is_parse_result_valid(parsed):
+                if is_valid:
                     # 移除原本的 JFULL，替換為 parsed_judgment
                     del data['JFULL']
                     data['parsed_judgment'] = parsed
@@ -308,16 +292,22 @@ class JudgmentParser:
                     print(f"解析結果無效，跳過處理: {file_path}")
                     return False
             
-            # 儲存結果到輸出路徑
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 儲存結果到輸出路徑（先完整序列化並編碼為位元組，再以二進位模式一次寫入）
+            # 不縮排時可使用 C 實作的編碼器
+            if pretty:
+                output_text = json.dumps(data, ensure_ascii=False, indent=2)
+            else:
+                output_text = json.dumps(data, ensure_ascii=False)
+            with open(output_path, 'wb') as f:
+                written_bytes = f.write(output_text.encode('utf-8'))
             
-            # 驗證輸出檔案是否成功創建
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            # 驗證輸出檔案是否成功寫入（直接使用寫入的位元組數，不必再查詢檔案狀態）
+            if written_bytes > 0:
                 # 如果成功處理且需要刪除原檔案
                 if delete_original:
                     os.remove(file_path)
-                    print(f"已刪除原檔案: {file_path}")
+                    if verbose:
+                        print(f"已刪除原檔案: {file_path}")
                 return True
             else:
                 print(f"輸出檔案創建失敗或為空: {output_path}")
@@ -327,13 +317,14 @@ class JudgmentParser:
             print(f"處理檔案 {file_path} 時發生錯誤: {e}")
             return False
     
-    def _process_file_batch(self, file_batch: List[str], thread_id: int) -> Dict[str, int]:
+    def _process_file_batch(self, file_batch: List[Tuple[str, str]], thread_id: int, verbose: bool = False) -> Dict[str, int]:
         """
-        處理一批檔案（單一執行緒）
+        處理一批檔案（在單一執行緒或子行程中依序處理）
         
         Args:
-            file_batch: 要處理的檔案列表
-            thread_id: 執行緒 ID
+            file_batch: 要處理的檔案列表，每個元素為 (檔名, 檔案路徑)
+            thread_id: 批次 ID
+            verbose: 是否逐檔顯示處理結果（預設只在批次開始與結束時顯示統計）
             
         Returns:
             處理統計結果
@@ -343,32 +334,37 @@ class JudgmentParser:
             'failed_files': 0
         }
         
-        print(f"執行緒 {thread_id}: 開始處理 {len(file_batch)} 個檔案")
+        print(f"批次 {thread_id}: 開始處理 {len(file_batch)} 個檔案")
         
-        for filename in file_batch:
-            input_path = os.path.join(self.input_dir, filename)
-            
+        # 輸出路徑前綴（含結尾的路徑分隔符）只計算一次，每個檔案直接串接新檔名
+        output_prefix = os.path.join(self.output_dir, '')
+        
+        for filename, input_path in file_batch:
             # 生成新的檔名：{原檔名}_parsed.json
-            name_without_ext = os.path.splitext(filename)[0]
-            new_filename = f"{name_without_ext}_parsed.json"
-            output_path = os.path.join(self.output_dir, new_filename)
+            new_filename = f"{filename.removesuffix('.json')}_parsed.json"
+            output_path = output_prefix + new_filename
             
-            if self.process_json_file(input_path, output_path, delete_original=True):
+            if self.process_json_file(input_path, output_path, delete_original=True, verbose=verbose):
                 stats['processed_files'] += 1
-                print(f"執行緒 {thread_id}: 成功處理 {filename} -> {new_filename}")
+                if verbose:
+                    print(f"批次 {thread_id}: 成功處理 {filename} -> {new_filename}")
             else:
                 stats['failed_files'] += 1
-                print(f"執行緒 {thread_id}: 處理失敗 {filename}")
+                if verbose:
+                    print(f"批次 {thread_id}: 處理失敗 {filename}")
         
-        print(f"執行緒 {thread_id}: 完成處理，成功 {stats['processed_files']} 個，失敗 {stats['failed_files']} 個")
+        print(f"批次 {thread_id}: 完成處理，成功 {stats['processed_files']} 個，失敗 {stats['failed_files']} 個")
         return stats
 
-    def process_directory_multithreaded(self, max_threads: int = 8) -> Dict[str, int]:
+    def process_directory_multithreaded(self, max_threads: int = 8, use_processes: bool = True, verbose: bool = False) -> Dict[str, int]:
         """
-        使用多執行緒處理目錄中的所有 JSON 檔案
+        使用多執行緒（預設為多行程）處理目錄中的所有 JSON 檔案
         
         Args:
-            max_threads: 最大執行緒數量
+            max_threads: 檔案分批的數量（多執行緒時即執行緒數量，多行程時行程數另受 CPU 核心數限制）
+            use_processes: 是否以多行程處理（解析與正則皆為 CPU 密集，多執行緒受 GIL 限制無法真正平行）；
+                           設為 False 時使用原本的多執行緒處理
+            verbose: 是否逐檔顯示處理結果（大量檔案時逐行輸出會拖慢處理速度）
             
         Returns:
             處理統計結果
@@ -379,8 +375,9 @@ class JudgmentParser:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
         
-        # 收集所有 JSON 檔案
-        json_files = [f for f in os.listdir(self.input_dir) if f.endswith('.json')]
+        # 收集所有 JSON 檔案（scandir 直接提供檔名與完整路徑，子行程不需另外組合路徑）
+        with os.scandir(self.input_dir) as entries:
+            json_files = [(entry.name, entry.path) for entry in entries if entry.name.endswith('.json') and entry.is_file()]
         total_files = len(json_files)
         
         if total_files == 0:
@@ -391,9 +388,7 @@ class JudgmentParser:
                 'failed_files': 0
             }
         
-        print(f"找到 {total_files} 個 JSON 檔案，將使用 {max_threads} 個執行緒處理")
-        
-        # 將檔案平均分配給各個執行緒
+        # 將檔案平均分配給各個批次
         files_per_thread = total_files // max_threads
         remainder = total_files % max_threads
         
@@ -401,26 +396,41 @@ class JudgmentParser:
         start_idx = 0
         
         for i in range(max_threads):
-            # 如果有餘數，前幾個執行緒多分配一個檔案
+            # 如果有餘數，前幾個批次多分配一個檔案
             batch_size = files_per_thread + (1 if i < remainder else 0)
             if batch_size > 0:
                 batch = json_files[start_idx:start_idx + batch_size]
                 file_batches.append(batch)
                 start_idx += batch_size
         
-        # 使用 ThreadPoolExecutor 執行多執行緒處理
         total_stats = {
             'total_files': total_files,
             'processed_files': 0,
             'failed_files': 0
         }
         
-        with ThreadPoolExecutor(max_workers=len(file_batches)) as executor:
+        if use_processes:
+            # 使用 ProcessPoolExecutor 執行多行程處理，行程數不超過 CPU 核心數
+            worker_count = min(len(file_batches), os.cpu_count() or 1)
+            executor = ProcessPoolExecutor(max_workers=worker_count, initializer=_init_worker)
+            worker_kind = '行程'
+        else:
+            # 使用 ThreadPoolExecutor 執行多執行緒處理
+            worker_count = len(file_batches)
+            executor = ThreadPoolExecutor(max_workers=worker_count)
+            worker_kind = '執行緒'
+        
+        print(f"找到 {total_files} 個 JSON 檔案，分為 {len(file_batches)} 批，將使用 {worker_count} 個{worker_kind}處理")
+        
+        with executor:
             # 提交所有任務
-            future_to_thread = {
-                executor.submit(self._process_file_batch, batch, i): i 
-                for i, batch in enumerate(file_batches)
-            }
+            future_to_thread = {}
+            for i, batch in enumerate(file_batches):
+                if use_processes:
+                    future = executor.submit(_process_file_batch_worker, self.output_dir, batch, i, verbose)
+                else:
+                    future = executor.submit(self._process_file_batch, batch, i, verbose)
+                future_to_thread[future] = i
             
             # 收集結果
             for future in as_completed(future_to_thread):
@@ -430,18 +440,19 @@ class JudgmentParser:
                     total_stats['processed_files'] += result['processed_files']
                     total_stats['failed_files'] += result['failed_files']
                 except Exception as exc:
-                    print(f'執行緒 {thread_id} 產生異常: {exc}')
-                    # 假設該執行緒的所有檔案都失敗
+                    print(f'批次 {thread_id} 產生異常: {exc}')
+                    # 假設該批次的所有檔案都失敗
                     total_stats['failed_files'] += len(file_batches[thread_id])
         
         return total_stats
-    def process_directory(self, dir_path: str = None, output_dir: str = None) -> Dict[str, int]:
+    def process_directory(self, dir_path: str = None, output_dir: str = None, max_workers: Optional[int] = None) -> Dict[str, int]:
         """
-        處理目錄中的所有 JSON 檔案（單執行緒版本，保持向後相容）
+        處理目錄中的所有 JSON 檔案（預設以多行程平行處理，保持向後相容的介面）
         
         Args:
             dir_path: 輸入目錄路徑（可選，使用預設路徑）
             output_dir: 輸出目錄路徑（可選，使用預設路徑）
+            max_workers: 平行處理的行程數量（預設為 CPU 核心數；設為 1 時不啟動子行程，直接在目前行程中依序處理）
             
         Returns:
             處理統計結果
@@ -462,19 +473,28 @@ class JudgmentParser:
             'failed_files': 0
         }
         
-        # 處理所有 JSON 檔案
-        for filename in os.listdir(input_path):
-            if filename.endswith('.json'):
-                stats['total_files'] += 1
-                
-                input_file_path = os.path.join(input_path, filename)
-                
-                # 生成新的檔名：{原檔名}_parsed.json
-                name_without_ext = os.path.splitext(filename)[0]
-                new_filename = f"{name_without_ext}_parsed.json"
-                output_file_path = os.path.join(output_path, new_filename)
-                
-                if self.process_json_file(input_file_path, output_file_path, delete_original=True):
+        # 收集所有 JSON 檔案
+        with os.scandir(input_path) as entries:
+            json_entries = [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+        json_files = [entry.name for entry in json_entries]
+        stats['total_files'] = len(json_files)
+        
+        input_file_paths = [entry.path for entry in json_entries]
+        # 生成新的檔名：{原檔名}_parsed.json
+        new_filenames = [f"{filename.removesuffix('.json')}_parsed.json" for filename in json_files]
+        output_prefix = os.path.join(output_path, '')
+        output_file_paths = [output_prefix + new_filename for new_filename in new_filenames]
+        
+        # 每個檔案彼此獨立，以多行程平行處理（解析與正則皆為 CPU 密集，不受 GIL 限制），統計在主行程中依序進行
+        with (nullcontext() if max_workers == 1 else ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)) as executor:
+            if executor is None:
+                # 單一行程時直接以目前的解析器依序處理
+                results = map(self.process_json_file, input_file_paths, output_file_paths)
+            else:
+                results = executor.map(_process_file_worker, input_file_paths, output_file_paths, chunksize=_CHUNK_SIZE)
+            
+            for filename, new_filename, success in zip(json_files, new_filenames, results):
+                if success:
                     stats['processed_files'] += 1
                     print(f"成功處理: {filename} -> {new_filename}")
                 else:
@@ -484,18 +504,62 @@ class JudgmentParser:
         return stats
 
 
+# 每個檔案都要完整解析並寫出，成本遠高於 flag_matching 只做標記比對，
+# 因此每次派送的檔案數比 POOL_CHUNK_SIZE 少，讓各子行程的負載較平均
+_CHUNK_SIZE = 16
+
+# 子行程中的解析器，由 _init_worker 在每個子行程啟動時建立一次，之後所有檔案共用
+_PARSER = None
+
+def _init_worker():
+    """
+    子行程初始化：建立解析器（預先編譯的正則只需建立一次，也不必在行程間傳遞解析器）
+    """
+    global _PARSER
+    _PARSER = JudgmentParser()
+
+def _process_file_worker(input_file_path: str, output_file_path: str) -> bool:
+    """
+    在子行程中處理單個 JSON 檔案（定義於模組層級以便傳遞給子行程）
+    
+    Args:
+        input_file_path: 輸入 JSON 檔案路徑
+        output_file_path: 輸出檔案路徑
+        
+    Returns:
+        處理是否成功
+    """
+    return _PARSER.process_json_file(input_file_path, output_file_path, delete_original=True)
+
+def _process_file_batch_worker(output_dir: str, file_batch: List[Tuple[str, str]], thread_id: int, verbose: bool = False) -> Dict[str, int]:
+    """
+    在子行程中處理一批檔案（定義於模組層級以便傳遞給子行程）
+    
+    Args:
+        output_dir: 輸出目錄路徑
+        file_batch: 要處理的檔案列表，每個元素為 (檔名, 檔案路徑)
+        thread_id: 批次 ID
+        verbose: 是否逐檔顯示處理結果
+        
+    Returns:
+        處理統計結果
+    """
+    _PARSER.output_dir = output_dir
+    return _PARSER._process_file_batch(file_batch, thread_id, verbose)
+
+
 def main():
     """
     主函式 - 示範用法
     """
     parser = JudgmentParser()
     
-    print("=== 多執行緒目錄處理 ===")
+    print("=== 分批平行目錄處理 ===")
     print(f"輸入目錄: {parser.input_dir}")
     print(f"輸出目錄: {parser.output_dir}")
     
     try:
-        # 使用多執行緒處理（預設 4 個執行緒）
+        # 分為 16 批平行處理（預設使用多行程）
         stats = parser.process_directory_multithreaded(max_threads=16)
         
         print(f"\n=== 處理完成 ===")
@@ -513,11 +577,13 @@ def main():
         print(f"處理過程中發生錯誤: {e}")
     
     print("\n=== 其他使用方式 ===")
-    print("# 使用單執行緒處理:")
+    print("# 在目前行程中依序處理（不啟動子行程）:")
+    print("stats = parser.process_directory(max_workers=1)")
+    print("# 以多行程逐檔平行處理:")
     print("stats = parser.process_directory()")
-    print("# 使用多執行緒處理:")
+    print("# 分批平行處理（預設使用多行程）:")
     print("stats = parser.process_directory_multithreaded(max_threads=8)")
-    print("# 自訂執行緒數量（建議根據 CPU 核心數調整）")
+    print("# 自訂分批數量（實際行程數不超過 CPU 核心數）")
 
 
 if __name__ == "__main__":